@@ -4,12 +4,13 @@ Autor: Pedro Pimentel, Guilherme Sampaio, Eduardo Oliveira, Daniel Koshino, Arth
 Data de entrega: 13/06/2025
 """
 
+from array import array
 from collections import defaultdict
-from functools import partial
+from functools import lru_cache, partial
+from itertools import compress
 from typing import Dict, List, Tuple, Callable
 import os
 import tempfile
-import copy
 import heapq
 import random
 import time
@@ -29,6 +30,8 @@ class Entrega:
         peso (int): Peso da carga em quilogramas.
         prazo (int): Prazo máximo para entrega, em horas.
     """
+    __slots__ = ('destino', 'peso', 'prazo')
+
     def __init__(self, destino, peso, prazo):
         self.destino = destino
         self.peso = peso
@@ -43,6 +46,8 @@ class Caminhao:
         capacidade (int): Capacidade restante em quilogramas.
         horas_disponiveis (float): Horas de operação disponíveis.
     """
+    __slots__ = ('id', 'capacidade', 'horas_disponiveis')
+
     def __init__(self, id, capacidade, horas_disponiveis):
         self.id = id
         self.capacidade = capacidade
@@ -57,6 +62,9 @@ cidades_destino = [
 # Centro de distribuição de onde saem os caminhões
 centros_distribuicao = ["Belém", "Recife", "Brasília", "São Paulo", "Florianópolis"]
 
+# Velocidade média dos caminhões (km/h), usada para converter distância em horas de viagem
+VELOCIDADE_MEDIA = 50
+
 # Dicionário com distâncias (em km) entre cada centro e destino
 from_distancias = {
     (c, d): dist for (c, d), dist in {
@@ -102,13 +110,11 @@ def gerar_entregas(n):
         List[Entrega]: Lista de objetos Entrega.
     """
 
-    entregas = []
-    for _ in range(n):
-        destino = random.choice(cidades_destino)
-        peso = random.randint(50, 500)
-        prazo = random.randint(12, 72)
-        entregas.append(Entrega(destino, peso, prazo))
-    return entregas
+    # Sorteia cada atributo em lote (random.choices) em vez de uma chamada por entrega
+    destinos = random.choices(cidades_destino, k=n)
+    pesos = random.choices(range(50, 501), k=n)
+    prazos = random.choices(range(12, 73), k=n)
+    return list(map(Entrega, destinos, pesos, prazos))
 
 
 def gerar_caminhoes(n):
@@ -121,12 +127,45 @@ def gerar_caminhoes(n):
         List[Caminhao]: Lista de objetos Caminhao.
     """
 
-    caminhoes = []
-    for i in range(n):
-        capacidade = random.randint(500, 1500)
-        horas = random.randint(10, 50)
-        caminhoes.append(Caminhao(i, capacidade, horas))
-    return caminhoes
+    capacidades = random.choices(range(500, 1501), k=n)
+    horas = random.choices(range(10, 51), k=n)
+    return list(map(Caminhao, range(n), capacidades, horas))
+
+
+def colunas_entregas(entregas):
+    """
+    Separa as entregas em colunas paralelas (uma por atributo), no lugar de uma lista de objetos.
+
+    Parâmetros:
+        entregas (list): Lista de objetos Entrega.
+    Retorna:
+        tuple: (destinos, pesos, prazos) onde:
+            destinos (List[str]): Cidade de destino de cada entrega.
+            pesos (array): Peso de cada entrega (array 'l').
+            prazos (array): Prazo de cada entrega (array 'l').
+    """
+    destinos = [e.destino for e in entregas]
+    pesos = array('l', [e.peso for e in entregas])
+    prazos = array('l', [e.prazo for e in entregas])
+    return destinos, pesos, prazos
+
+
+def colunas_caminhoes(caminhoes):
+    """
+    Separa a frota em colunas paralelas (uma por atributo), no lugar de uma lista de objetos.
+
+    Parâmetros:
+        caminhoes (list): Lista de objetos Caminhao.
+    Retorna:
+        tuple: (ids, capacidades, horas) onde:
+            ids (array): Identificadores dos caminhões (array 'l').
+            capacidades (array): Capacidade restante de cada caminhão (array 'l').
+            horas (array): Horas disponíveis de cada caminhão (array 'd').
+    """
+    ids = array('l', [c.id for c in caminhoes])
+    capacidades = array('l', [c.capacidade for c in caminhoes])
+    horas = array('d', [c.horas_disponiveis for c in caminhoes])
+    return ids, capacidades, horas
 
 
 def gerar_lista_adjacencia():
@@ -146,31 +185,78 @@ def gerar_lista_adjacencia():
     return grafo
 
 
+def gerar_grafo_direcionado():
+    """
+    Constrói um grafo de lista de adjacência apenas com arestas centro -> destino,
+    mesmas arestas da matriz de adjacência.
+
+    As distâncias não são as mesmas do grafo bidirecional: com as arestas de volta,
+    alguns pares têm caminho mais curto passando por outras cidades (ex.: Recife ->
+    Porto Alegre cai de 3600 para 3170 km). As alocações não mudam porque o
+    planejamento só usa o centro mais próximo de cada destino, e esse é sempre
+    uma aresta direta, que nenhum desvio encurta.
+
+    Retorna:
+        Dict[str, List[Tuple[str, int]]]: Grafo mapeando centro -> [(destino, distancia)].
+    """
+    grafo = defaultdict(list)
+    for (c, d), distancia in from_distancias.items():
+        grafo[c].append((d, distancia))
+    return grafo
+
+
 def gerar_matriz_adjacencia():
     """
     Constrói matriz de adjacência e índices de nós.
 
     Retorna:
         tuple: (matriz, idx, nodes) onde:
-            matriz (List[List[float]]): Distâncias ou inf.
+            matriz (List[array]): Linhas contíguas de float (array 'd') com distâncias, 0 sem aresta.
             idx (Dict[str, int]): Mapeamento nó -> índice.
             nodes (List[str]): Lista ordenada de nós (centros + destinos).
     """
     nodes = centros_distribuicao + cidades_destino
     idx = {node: i for i, node in enumerate(nodes)}
     size = len(nodes)
-    matriz = [[float('inf')] * size for _ in range(size)]
+    # 0 marca ausência de aresta (toda distância real é positiva)
+    matriz = [array('d', [0.0]) * size for _ in range(size)]
     for c in centros_distribuicao:
         for d in cidades_destino:
             i, j = idx[c], idx[d]
             matriz[i][j] = from_distancias[(c, d)]
     return matriz, idx, nodes
 
+def gerar_csr(grafo):
+    """
+    Converte um grafo de lista de adjacência para o formato CSR (compressed sparse row).
+
+    Parâmetros:
+        grafo (dict): Grafo de lista de adjacência.
+    Retorna:
+        tuple: (indptr, indices, pesos, idx, nodes) onde:
+            indptr (array): Início das arestas de cada nó em 'indices'/'pesos' (array 'i', n+1).
+            indices (array): Nó de chegada de cada aresta (array 'i').
+            pesos (array): Distância de cada aresta (array 'd').
+            idx (Dict[str, int]): Mapeamento nó -> índice.
+            nodes (List[str]): Lista ordenada de nós (centros + destinos).
+    """
+    nodes = centros_distribuicao + cidades_destino
+    idx = {node: i for i, node in enumerate(nodes)}
+    indptr = array('i', [0])
+    indices = array('i')
+    pesos = array('d')
+    for node in nodes:
+        for vizinho, distancia in grafo.get(node, ()):
+            indices.append(idx[vizinho])
+            pesos.append(distancia)
+        indptr.append(len(indices))
+    return indptr, indices, pesos, idx, nodes
+
 # ========================
 #   Algoritmo de Dijkstra
 # ========================
 
-def dijkstra_lista_heap(grafo, origem, destino):
+def dijkstra_lista_heap(grafo, origem, destino, dist_limite=float('inf')):
     """
     Calcula menor distância usando heap e grafo de lista de adjacência.
 
@@ -178,42 +264,54 @@ def dijkstra_lista_heap(grafo, origem, destino):
         grafo (dict): Grafo de lista de adjacência.
         origem (str): Nó de partida.
         destino (str): Nó de chegada.
+        dist_limite (float): Interrompe a busca ao ultrapassar esta distância.
     Retorna:
-        float: Distância mínima ou inf se não alcançável.
+        float: Distância mínima, ou inf se não alcançável dentro de dist_limite.
     """
     heap = [(0, origem)]
     visitados = set()
+    # Referências locais evitam a busca de globais/atributos a cada iteração
+    heappop, heappush, visitar, vizinhos_de = heapq.heappop, heapq.heappush, visitados.add, grafo.get
 
     while heap:
-        dist_atual, no = heapq.heappop(heap)
+        dist_atual, no = heappop(heap)
+        if dist_atual > dist_limite:
+            return float('inf')  # nós restantes estão ainda mais distantes
         if no == destino:
             return dist_atual
         if no in visitados:
             continue
-        visitados.add(no)
-        for vizinho, peso in grafo.get(no, []):
+        visitar(no)
+        for vizinho, peso in vizinhos_de(no, ()):
             if vizinho not in visitados:
-                heapq.heappush(heap, (dist_atual + peso, vizinho))
+                heappush(heap, (dist_atual + peso, vizinho))
     return float('inf')
 
 
-def dijkstra_lista_simples(grafo, origem, destino):
+def dijkstra_lista_simples(grafo, origem, destino, dist_limite=float('inf')):
     """
     Calcula menor distância usando lista simples (busca linear).
+    Mantida como referência para o benchmark; o roteamento usa dijkstra_lista_heap.
 
     Parâmetros:
         grafo (dict): Grafo de lista de adjacência.
         origem (str): Nó de partida.
         destino (str): Nó de chegada.
+        dist_limite (float): Interrompe a busca ao ultrapassar esta distância.
     Retorna:
-        float: Distância mínima ou inf.
+        float: Distância mínima, ou inf se não alcançável dentro de dist_limite.
     """
     fila = [(0, origem)]
     visitados = set()
 
     while fila:
-        dist_atual, no = min(fila, key=lambda x: x[0])
-        fila.remove((dist_atual, no))
+        # Busca linear pelo menor elemento; troca com o último para remover em O(1)
+        k = min(range(len(fila)), key=fila.__getitem__)
+        dist_atual, no = fila[k]
+        fila[k] = fila[-1]
+        fila.pop()
+        if dist_atual > dist_limite:
+            return float('inf')  # nós restantes estão ainda mais distantes
         if no == destino:
             return dist_atual
         if no in visitados:
@@ -225,7 +323,7 @@ def dijkstra_lista_simples(grafo, origem, destino):
     return float('inf')
 
 
-def dijkstra_matriz_heap(matriz, idx, nodes, origem, destino):
+def dijkstra_matriz_heap(matriz, idx, nodes, origem, destino, dist_limite=float('inf')):
     """
     Calcula menor distância usando heap e matriz de adjacência.
 
@@ -235,31 +333,38 @@ def dijkstra_matriz_heap(matriz, idx, nodes, origem, destino):
         nodes (list): Lista de nós.
         origem (str): Nó de partida.
         destino (str): Nó de chegada.
+        dist_limite (float): Interrompe a busca ao ultrapassar esta distância.
     Retorna:
-        float: Distância mínima ou inf.
+        float: Distância mínima, ou inf se não alcançável dentro de dist_limite.
     """
     heap = [(0, origem)]
     visitados = set()
+    # Referências locais evitam a busca de globais/atributos a cada iteração
+    heappop, heappush, visitar = heapq.heappop, heapq.heappush, visitados.add
+    colunas = range(len(nodes))
 
     while heap:
-        dist_atual, no = heapq.heappop(heap)
+        dist_atual, no = heappop(heap)
+        if dist_atual > dist_limite:
+            return float('inf')  # nós restantes estão ainda mais distantes
         if no == destino:
             return dist_atual
         if no in visitados:
             continue
-        visitados.add(no)
-        i = idx[no]
-        for j, peso in enumerate(matriz[i]):
-            if peso != float('inf'):
-                vizinho = nodes[j]
-                if vizinho not in visitados:
-                    heapq.heappush(heap, (dist_atual + peso, vizinho))
+        visitar(no)
+        linha = matriz[idx[no]]
+        # A própria linha serve de máscara (0 = sem aresta): compress filtra em C
+        for j in compress(colunas, linha):
+            vizinho = nodes[j]
+            if vizinho not in visitados:
+                heappush(heap, (dist_atual + linha[j], vizinho))
     return float('inf')
 
 
-def dijkstra_matriz_simples(matriz, idx, nodes, origem, destino):
+def dijkstra_matriz_simples(matriz, idx, nodes, origem, destino, dist_limite=float('inf')):
     """
     Calcula menor distância usando lista simples e matriz de adjacência.
+    Mantida como referência para o benchmark; o roteamento usa dijkstra_matriz_heap.
 
     Parâmetros:
         matriz (list): Matriz de distâncias.
@@ -267,39 +372,214 @@ def dijkstra_matriz_simples(matriz, idx, nodes, origem, destino):
         nodes (list): Lista de nós.
         origem (str): Nó de partida.
         destino (str): Nó de chegada.
+        dist_limite (float): Interrompe a busca ao ultrapassar esta distância.
     Retorna:
-        float: Distância mínima ou inf.
+        float: Distância mínima, ou inf se não alcançável dentro de dist_limite.
     """
     fila = [(0, origem)]
     visitados = set()
 
     while fila:
-        dist_atual, no = min(fila, key=lambda x: x[0])
-        fila.remove((dist_atual, no))
+        # Busca linear pelo menor elemento; troca com o último para remover em O(1)
+        k = min(range(len(fila)), key=fila.__getitem__)
+        dist_atual, no = fila[k]
+        fila[k] = fila[-1]
+        fila.pop()
+        if dist_atual > dist_limite:
+            return float('inf')  # nós restantes estão ainda mais distantes
         if no == destino:
             return dist_atual
         if no in visitados:
             continue
         visitados.add(no)
-        i = idx[no]
-        for j, peso in enumerate(matriz[i]):
-            if peso != float('inf'):
-                vizinho = nodes[j]
-                if vizinho not in visitados:
-                    fila.append((dist_atual + peso, vizinho))
+        linha = matriz[idx[no]]
+        # A própria linha serve de máscara (0 = sem aresta): compress filtra em C
+        for j in compress(range(len(linha)), linha):
+            vizinho = nodes[j]
+            if vizinho not in visitados:
+                fila.append((dist_atual + linha[j], vizinho))
+    return float('inf')
+
+def dijkstra_csr_heap(indptr, indices, pesos, idx, origem, destino, dist_limite=float('inf')):
+    """
+    Calcula menor distância usando heap e grafo em formato CSR.
+
+    Parâmetros:
+        indptr (array): Início das arestas de cada nó.
+        indices (array): Nó de chegada de cada aresta.
+        pesos (array): Distância de cada aresta.
+        idx (dict): Mapeamento nó -> índice.
+        origem (str): Nó de partida.
+        destino (str): Nó de chegada.
+        dist_limite (float): Interrompe a busca ao ultrapassar esta distância.
+    Retorna:
+        float: Distância mínima, ou inf se não alcançável dentro de dist_limite.
+    """
+    if origem not in idx or destino not in idx:
+        return float('inf')
+    alvo = idx[destino]
+    heap = [(0, idx[origem])]
+    visitados = bytearray(len(indptr) - 1)
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    while heap:
+        dist_atual, i = heappop(heap)
+        if dist_atual > dist_limite:
+            return float('inf')  # nós restantes estão ainda mais distantes
+        if i == alvo:
+            return dist_atual
+        if visitados[i]:
+            continue
+        visitados[i] = 1
+        # As arestas de i são contíguas em indices/pesos
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if not visitados[j]:
+                heappush(heap, (dist_atual + pesos[k], j))
     return float('inf')
 
+# ========================
+#   Tabela de Distâncias
+# ========================
+
+def distancia_maxima_util(entregas, caminhoes):
+    """
+    Calcula a maior distância que ainda pode gerar uma alocação: acima dela
+    nenhum caminhão tem horas e nenhuma entrega tem prazo para a viagem.
+
+    Parâmetros:
+        entregas (list): Lista de objetos Entrega.
+        caminhoes (list): Lista de objetos Caminhao.
+    Retorna:
+        float: Distância máxima útil em km.
+    """
+    horas = max((c.horas_disponiveis for c in caminhoes), default=0)
+    prazo = max((e.prazo for e in entregas), default=0)
+    return min(horas, prazo) * VELOCIDADE_MEDIA
+
+
+def precalcular_distancias(buscar, centros, destinos, dist_limite=float('inf')):
+    """
+    Calcula uma única vez a distância de cada centro para cada destino.
+
+    Parâmetros:
+        buscar (callable): Função de busca de distância (origem, destino, dist_limite).
+        centros (list): Lista de nomes de centros de distribuição.
+        destinos (list): Lista de nomes de cidades de destino.
+        dist_limite (float): Pares mais distantes que isso são registrados como inf.
+    Retorna:
+        dict: mapeia (centro, destino) -> distância mínima ou inf.
+    """
+    return {(c, d): buscar(c, d, dist_limite) for c in centros for d in destinos}
+
+def floyd_warshall(matriz):
+    """
+    Calcula a menor distância entre todos os pares de nós (Floyd–Warshall).
+    Mantido como implementação comparada no benchmark: na matriz deste projeto só há
+    arestas centro -> destino e nenhuma sai de um destino, então nenhum caminho tem
+    mais de uma aresta e o resultado coincide com as próprias arestas (from_distancias).
+
+    Parâmetros:
+        matriz (list): Matriz de distâncias (linhas array 'd', 0 sem aresta).
+    Retorna:
+        list: Matriz (linhas array 'd') com a distância mínima de i para j, ou inf.
+    """
+    n = len(matriz)
+    # Converte a ausência de aresta (0) para inf antes de relaxar os caminhos
+    dist = [array('d', [p if p else float('inf') for p in linha]) for linha in matriz]
+    for i in range(n):
+        dist[i][i] = 0.0
+    for k in range(n):
+        linha_k = dist[k]
+        for i in range(n):
+            linha_i = dist[i]
+            via_k = linha_i[k]
+            if via_k == float('inf'):
+                continue
+            for j in range(n):
+                nova = via_k + linha_k[j]
+                if nova < linha_i[j]:
+                    linha_i[j] = nova
+    return dist
+
+
+def tabela_floyd_warshall(matriz, idx, centros, destinos):
+    """
+    Monta a tabela (centro, destino) -> distância a partir de floyd_warshall.
+
+    Parâmetros:
+        matriz (list): Matriz de distâncias.
+        idx (dict): Mapeamento nó -> índice.
+        centros (list): Lista de nomes de centros de distribuição.
+        destinos (list): Lista de nomes de cidades de destino.
+    Retorna:
+        dict: mapeia (centro, destino) -> distância mínima ou inf.
+    """
+    dist = floyd_warshall(matriz)
+    return {(c, d): dist[idx[c]][idx[d]] for c in centros for d in destinos}
+
+# ========================
+#   Índice de Caminhões
+# ========================
+
+class IndiceCaminhoes:
+    """
+    Busca first-fit na frota (primeiro caminhão, na ordem original, que comporta a
+    entrega) com memória das buscas sem resultado.
+
+    A varredura em si é O(K). Buscas sem resultado são as mais caras, pois percorrem a
+    frota inteira; como capacidade e horas só diminuem, cada falha fica registrada em
+    'falhas' e as consultas dominadas por uma falha anterior (peso e horas maiores ou
+    iguais) são respondidas sem varrer a frota.
+
+    Atributos:
+        capacidades (array): Coluna de capacidades da frota, na ordem original.
+        horas (array): Coluna de horas disponíveis da frota, na ordem original.
+        falhas (dict): horas de viagem -> menor peso para o qual nenhum caminhão serviu.
+    """
+    def __init__(self, capacidades, horas):
+        self.capacidades = capacidades
+        self.horas = horas
+        self.falhas = {}
+
+    def primeiro_viavel(self, peso, horas):
+        """
+        Busca o primeiro caminhão, na ordem da frota, que comporta a entrega.
+        Supõe que capacidades e horas só diminuem entre as chamadas.
+
+        Parâmetros:
+            peso (int): Peso da carga em quilogramas.
+            horas (float): Horas de viagem necessárias.
+        Retorna:
+            int: Posição do caminhão nas colunas, ou None se nenhum servir.
+        """
+        # Se já faltou caminhão para uma entrega mais leve e uma viagem mais curta,
+        # continua faltando: a frota só perde capacidade e horas
+        for horas_falha, peso_falha in self.falhas.items():
+            if horas_falha <= horas and peso_falha <= peso:
+                return None
+
+        capacidades, horas_disp = self.capacidades, self.horas
+        for i in range(len(capacidades)):
+            if capacidades[i] >= peso and horas_disp[i] >= horas:
+                return i
+
+        if peso < self.falhas.get(horas, float('inf')):
+            self.falhas[horas] = peso
+        return None
+
 # ========================
 #   Planejamento de Rotas
 # ========================
 
-def planejar_rotas(entregas, caminhoes, centros, buscar):
+def planejar_rotas(entregas, frota, centros, buscar):
     """
     Aloca entregas a caminhões e centros baseando-se em menor distância.
 
     Parâmetros:
         entregas (list): Lista de objetos Entrega, ordenados por prazo.
-        caminhoes (list): Lista de objetos Caminhao disponíveis.
+        frota (tuple): Colunas (ids, capacidades, horas) de colunas_caminhoes;
+            capacidades e horas são consumidas no próprio lugar.
         centros (list): Lista de nomes de centros de distribuição.
         buscar (callable): Função de busca de distância (origem->destino).
     Retorna:
@@ -307,34 +587,54 @@ def planejar_rotas(entregas, caminhoes, centros, buscar):
             rotas (dict): mapeia id do caminhão -> lista de (centro, destino, km).
             nao_alocadas (list): entregas que não caberam.
     """
-    rotas = {c.id: [] for c in caminhoes}
+    # A frota é manipulada em colunas paralelas, sem acesso a atributos no laço principal
+    ids, capacidades, horas = frota
+    rotas = {cid: [] for cid in ids}
     nao_alocadas = []
-
-    # Ordena entregas pelo prazo (mais urgente primeiro)
-    for entrega in sorted(entregas, key=lambda x: x.prazo):
-        melhor = (None, None, float('inf'))  # (caminhao, centro, distancia)
-        for centro in centros:
-            distancia = buscar(centro, entrega.destino)
-            if distancia == float('inf'):
-                continue
-            horas_viagem = distancia / 50  # considera velocidade fixa de 50 km/h
-
-            # Testa todos os caminhões para achar o mais adequado
-            for cam in caminhoes:
-                if (cam.capacidade >= entrega.peso and
-                    cam.horas_disponiveis >= horas_viagem and
-                    horas_viagem <= entrega.prazo):
-                    if distancia < melhor[2]:
-                        melhor = (cam, centro, distancia)
+    # destino -> [(horas_viagem, distancia, centro)] em ordem crescente, montado uma vez por destino;
+    # o planejamento usa apenas o primeiro (o centro mais próximo)
+    centros_por_destino = {}
+    indice = IndiceCaminhoes(capacidades, horas)
+    primeiro_viavel = indice.primeiro_viavel
+
+    destinos, pesos, prazos = colunas_entregas(entregas)
+
+    # Ordena os índices pelo prazo (mais urgente primeiro); a chave é o próprio
+    # __getitem__ da coluna, sem lambda, e o sort estável mantém a ordem nos empates
+    for k in sorted(range(len(entregas)), key=prazos.__getitem__):
+        destino, peso, prazo = destinos[k], pesos[k], prazos[k]
+        candidatos = centros_por_destino.get(destino)
+        if candidatos is None:
+            # sort estável: em caso de empate prevalece a ordem de 'centros'
+            candidatos = sorted(
+                ((buscar(centro, destino), centro) for centro in centros),
+                key=lambda x: x[0]
+            )
+            # Horas de viagem calculadas aqui, uma vez por (centro, destino), e não por entrega
+            candidatos = [
+                (dist / VELOCIDADE_MEDIA, dist, centro)
+                for dist, centro in candidatos if dist != float('inf')
+            ]
+            centros_por_destino[destino] = candidatos
+
+        melhor = (None, None, None, None)  # (posicao do caminhao, centro, distancia, horas)
+        # Só o centro mais próximo precisa ser testado: os caminhões não pertencem a um
+        # centro, e um centro mais distante exige mais horas para o mesmo peso. Se nenhum
+        # caminhão serve para o mais próximo (ou ele já estoura o prazo), nenhum outro serve.
+        if candidatos and candidatos[0][0] <= prazo:
+            horas_viagem, distancia, centro = candidatos[0]
+            pos = primeiro_viavel(peso, horas_viagem)
+            if pos is not None:
+                melhor = (pos, centro, distancia, horas_viagem)
 
         # Se encontrou combinação válida, aplica alocação
-        cam_sel, centro_sel, dist_sel = melhor
-        if cam_sel:
-            cam_sel.capacidade -= entrega.peso
-            cam_sel.horas_disponiveis -= dist_sel / 50
-            rotas[cam_sel.id].append((centro_sel, entrega.destino, dist_sel))
+        pos_sel, centro_sel, dist_sel, horas_sel = melhor
+        if pos_sel is not None:
+            capacidades[pos_sel] -= peso
+            horas[pos_sel] -= horas_sel
+            rotas[ids[pos_sel]].append((centro_sel, destino, dist_sel))
         else:
-            nao_alocadas.append(entrega)
+            nao_alocadas.append(entregas[k])
 
     return rotas, nao_alocadas
 
@@ -366,12 +666,9 @@ def escalar_matriz(matriz, escala):
         matriz (list): Matriz original.
         escala (float): Fator de escala.
     Retorna:
-        list: Matriz escalada.
+        list: Matriz escalada (linhas array 'd'); o 0 de ausência de aresta é preservado.
     """
-    return [
-        [(d * escala if d != float('inf') else float('inf')) for d in row]
-        for row in matriz
-    ]
+    return [array('d', [d * escala for d in row]) for row in matriz]
 
 
 # ========================
@@ -394,32 +691,47 @@ def escrever_resumo_entregas(
       Entrega para BH a partir de SP (Caminhão 2): 590 km
     Exemplo de linha com '*':
       *Entrega para RJ a partir de BH (Caminhão 2): 450 km
-    """
-    with open(filename, "w", encoding="utf-8") as f:
-        f.write("=== Resumo das Entregas ===\n")
-        for cid, lst in rotas.items():
-            last_orig: str = None
-            for idx, (centro, destino, _) in enumerate(lst):
-                if idx == 0:
-                    origem = centro
-                    star = ""
-                else:
-                    origem = last_orig
-                    star = "*"
+
+    Apenas as linhas com '*' consultam 'buscar'; as demais usam o km guardado em 'rotas'.
+    """
+    # Acumula as linhas e grava tudo de uma vez, em vez de um write por entrega
+    linhas: List[str] = ["=== Resumo das Entregas ==="]
+    for cid, lst in rotas.items():
+        last_orig: str = None
+        for idx, (centro, destino, km) in enumerate(lst):
+            if idx == 0:
+                # A distância centro -> destino já veio calculada em 'rotas'
+                origem = centro
+                star = ""
+                dist = km
+            else:
+                origem = last_orig
+                star = "*"
                 dist = buscar(origem, destino)
-                f.write(f"{star}Entrega para {destino} a partir de {origem} (Caminhão {cid}): {dist:.0f} km\n")
-                last_orig = destino
+            linhas.append(f"{star}Entrega para {destino} a partir de {origem} (Caminhão {cid}): {dist:.0f} km")
+            last_orig = destino
+
+    with open(filename, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write("\n".join(linhas))
+        f.write("\n")
 
 # ========================
 #   Benchmark de Desempenho
 # ========================
 
-def benchmark_distancias(escala, entregas, caminhoes, grafo0, mat0, idx, nodes):
+# Implementações comparadas no benchmark, na ordem em que aparecem nos resultados
+implementacoes = [
+    "Lista Simples (Adj)", "Heap (Adj)", "Lista Simples (Mat)", "Heap (Mat)", "Heap (CSR)",
+    "Floyd-Warshall (Mat)"
+]
+
+def benchmark_distancias(escala, nome, entregas, caminhoes, grafo0, mat0, idx, nodes):
     """
-    Executa benchmarks comparando tempo e memória de quatro implementações.
+    Executa o benchmark de tempo e memória de uma implementação em uma escala.
 
     Parâmetros:
         escala (float): Fator de escala para distâncias.
+        nome (str): Implementação a medir (um dos itens de 'implementacoes').
         entregas (list): Lista de objetos Entrega.
         caminhoes (list): Frota de caminhões.
         grafo0 (dict): Grafo original.
@@ -427,48 +739,77 @@ def benchmark_distancias(escala, entregas, caminhoes, grafo0, mat0, idx, nodes):
         idx (dict): Índices de nós.
         nodes (list): Lista de nós.
     Retorna:
-        dict: mapeando nome da implementação -> métricas de tempo e memória.
+        dict: métricas de tempo e memória da implementação; mem_KB é None
+            quando a variável de ambiente BENCH_MEM não está definida.
     """
     # Aplica escala aos dados originais
     grafo = escalar_grafo(grafo0, escala)
     matriz = escalar_matriz(mat0, escala)
+    indptr, indices, pesos, idx_csr, _ = gerar_csr(grafo)
 
     funcs = {
-        "Lista Simples (Adj)": lambda o, d: dijkstra_lista_simples(grafo, o, d),
-        "Heap (Adj)"         : lambda o, d: dijkstra_lista_heap(grafo, o, d),
-        "Lista Simples (Mat)": lambda o, d: dijkstra_matriz_simples(matriz, idx, nodes, o, d),
-        "Heap (Mat)"         : lambda o, d: dijkstra_matriz_heap(matriz, idx, nodes, o, d),
+        "Lista Simples (Adj)": lambda o, d, lim: dijkstra_lista_simples(grafo, o, d, lim),
+        "Heap (Adj)"         : lambda o, d, lim: dijkstra_lista_heap(grafo, o, d, lim),
+        "Lista Simples (Mat)": lambda o, d, lim: dijkstra_matriz_simples(matriz, idx, nodes, o, d, lim),
+        "Heap (Mat)"         : lambda o, d, lim: dijkstra_matriz_heap(matriz, idx, nodes, o, d, lim),
+        "Heap (CSR)"         : lambda o, d, lim: dijkstra_csr_heap(indptr, indices, pesos, idx_csr, o, d, lim),
     }
+    # Distâncias acima deste limite nunca resultam em alocação; a busca pode parar antes
+    limite = distancia_maxima_util(entregas, caminhoes)
+    # Estado inicial da frota em colunas; cada execução recebe uma cópia (memcpy)
+    ids, cap0, horas0 = colunas_caminhoes(caminhoes)
+
+    def executar():
+        # monta a tabela de distâncias com a implementação medida
+        if nome == "Floyd-Warshall (Mat)":
+            tabela = tabela_floyd_warshall(matriz, idx, centros_distribuicao, cidades_destino)
+        else:
+            tabela = precalcular_distancias(funcs[nome], centros_distribuicao, cidades_destino, limite)
 
-    resultados = {}
-    for nome, func in funcs.items():
-        start = time.perf_counter()
-        tracemalloc.start()
-
-        # executa roteamento completo
-        _rotas, _nao = planejar_rotas(
+        # executa roteamento completo consultando apenas a tabela
+        return planejar_rotas(
             entregas,
-            copy.deepcopy(caminhoes),
+            (ids, cap0[:], horas0[:]),
             centros_distribuicao,
-            func
+            lambda o, d: tabela[o, d]
         )
 
-        duracao = time.perf_counter() - start
+    # Tempo medido sem tracemalloc, que instrumenta cada alocação e distorce a comparação
+    start = time.perf_counter()
+    executar()
+    duracao = time.perf_counter() - start
+
+    # Memória só com BENCH_MEM definida, numa execução independente da cronometrada
+    memoria_kb = None
+    if os.getenv("BENCH_MEM"):
+        tracemalloc.start()
+        _rotas, _nao = executar()
         memoria, _ = tracemalloc.get_traced_memory()
         tracemalloc.stop()
+        memoria_kb = memoria / 1024
+
+    return {"tempo_s": duracao, "mem_KB": memoria_kb}
 
-        resultados[nome] = {"tempo_s": duracao, "mem_KB": memoria / 1024}
-    return resultados
+# Dados fixos do cenário em cada processo do Pool, preenchidos por iniciar_worker
+dados_cenario = None
 
-def rodar_uma_escala(args):
+def iniciar_worker(entregas, caminhoes, grafo0, mat0, idx, nodes):
+    """
+    Initializer do multiprocessing.Pool: recebe os dados do cenário uma única vez
+    por processo, em vez de serializá-los junto com cada tarefa.
+    """
+    global dados_cenario
+    dados_cenario = (entregas, caminhoes, grafo0, mat0, idx, nodes)
+
+def rodar_uma_tarefa(args):
     """
     Função helper para multiprocessing: 
-    args = (escala, entregas, caminhoes, grafo0, mat0, idx, nodes)
-    Retorna (escala, resultados_do_benchmark).
+    args = (escala, nome); os demais dados vêm de 'dados_cenario'.
+    Retorna (escala, nome, resultados_do_benchmark).
     """
-    escala, entregas, caminhoes, grafo0, mat0, idx, nodes = args
-    res = benchmark_distancias(escala, entregas, caminhoes, grafo0, mat0, idx, nodes)
-    return escala, res
+    escala, nome = args
+    res = benchmark_distancias(escala, nome, *dados_cenario)
+    return escala, nome, res
 
 # ========================
 #   Ponto de Entrada
@@ -507,12 +848,18 @@ def main():
             entregas = gerar_entregas(n_ent)
             caminhoes = gerar_caminhoes(n_cam)
 
-            # Resumo de entregas
-            grafo = gerar_lista_adjacencia()
-            buscar = partial(dijkstra_lista_heap, grafo)
-            rotas, nao_alocadas = planejar_rotas(entregas, caminhoes, centros_distribuicao, buscar)
+            # Resumo de entregas: no grafo direcionado a menor distância centro -> destino
+            # é a própria aresta, então a tabela é lida direto de from_distancias
+            frota = colunas_caminhoes(caminhoes)
+            rotas, nao_alocadas = planejar_rotas(
+                entregas, frota, centros_distribuicao, lambda o, d: from_distancias[o, d]
+            )
 
-            # escreve o resumo também dentro da pasta
+            # escreve o resumo também dentro da pasta; entregas subsequentes partem de
+            # um destino, por isso aqui o grafo precisa das arestas nos dois sentidos
+            grafo = gerar_lista_adjacencia()
+            # Memoiza por (origem, destino): o resumo repete os mesmos pares muitas vezes
+            buscar = lru_cache(maxsize=None)(partial(dijkstra_lista_heap, grafo))
             resumo_path = os.path.join(caminho_saida, f"resumo_{n_ent}x{n_cam}.txt")
             escrever_resumo_entregas(rotas, buscar, filename=resumo_path)
 
@@ -524,32 +871,39 @@ def main():
                         f.write(f"{e.destino}, peso={e.peso}, prazo={e.prazo}\n")
 
             # Prepara dados para o benchmark
-            grafo0 = gerar_lista_adjacencia()
+            grafo0 = gerar_grafo_direcionado()
             mat0, idx, nodes = gerar_matriz_adjacencia()
 
-            # Monta a lista de argumentos para cada escala
-            tarefas = [
-                (esc, entregas, caminhoes, grafo0, mat0, idx, nodes)
-                for esc in escalas
-            ]
+            # Monta a lista de argumentos: uma tarefa por (escala, implementação)
+            tarefas = [(esc, nome) for esc in escalas for nome in implementacoes]
 
-            # Utilizacao do multiprocessing.Pool para executar rodar_uma_escala em paralelo nas tarefas (escalas e métricas)
-            pool = Pool(processes=cpu_count())
-            resultados_list = pool.map(rodar_uma_escala, tarefas)
+            # Um único Pool plano executa todas as tarefas em paralelo (sem Pool aninhado);
+            # os dados do cenário são enviados uma vez por processo pelo initializer
+            pool = Pool(
+                processes=cpu_count(),
+                initializer=iniciar_worker,
+                initargs=(entregas, caminhoes, grafo0, mat0, idx, nodes)
+            )
+            resultados_list = pool.map(rodar_uma_tarefa, tarefas)
 
             pool.close()
             pool.join()
 
-            # Itera sobre cada resultado de escala e grava no arquivo de saída
-            for escala, resultados in resultados_list:
+            # Agrupa por escala mantendo a ordem das tarefas e grava no arquivo de saída
+            resultados_por_escala = defaultdict(dict)
+            for escala, nome, dados in resultados_list:
+                resultados_por_escala[escala][nome] = dados
+
+            for escala, resultados in resultados_por_escala.items():
                 print(f"[Cenário {n_ent}x{n_cam}] Escala {escala:.2f} concluída")
                 for estrutura, dados in resultados.items():
+                    mem = "-" if dados['mem_KB'] is None else f"{dados['mem_KB']:.2f}"
                     arquivo.write(
                         f"{n_ent}x{n_cam}\t"
                         f"{escala:.2f}\t"
                         f"{estrutura}\t"
                         f"{dados['tempo_s']:.6f}\t"
-                        f"{dados['mem_KB']:.2f}\n"
+                        f"{mem}\n"
                     )
 
     print(f"Benchmark finalizado. Confira '{resultados_path}'.")